@@ -2,14 +2,18 @@
 PaperSeeker - AI-Powered Academic Paper Recommendation System
 """
 
+import asyncio
 import sys
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from pathlib import Path
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.config import get_config
+from openai import AsyncOpenAI
+
+from src.config import Config, get_config
 from src.paper_searcher import OpenAlexSearcher
 from src.paper_filter import PaperFilter, KeywordFilter
 from src.summarizer import AbstractSummarizer
@@ -21,6 +25,18 @@ def daily_task(from_date: str = None, to_date: str = None, days_back: int = None
     """
     Daily paper push task
 
+    Args:
+        from_date: Start date (YYYY-MM-DD)
+        to_date: End date (YYYY-MM-DD)
+        days_back: Search recent N days
+    """
+    asyncio.run(adaily_task(from_date, to_date, days_back))
+
+
+async def adaily_task(from_date: str = None, to_date: str = None, days_back: int = None):
+    """
+    Daily paper push task, inside a running event loop
+
     Args:
         from_date: Start date (YYYY-MM-DD)
         to_date: End date (YYYY-MM-DD)
@@ -29,27 +45,49 @@ def daily_task(from_date: str = None, to_date: str = None, days_back: int = None
     # Load configuration
     config = get_config()
 
+    # One LLM client (and connection pool) serves both the AI filter and the summarizer
+    llm_client = nullcontext()
+    if config.llm_api_key:
+        llm_client = AsyncOpenAI(api_key=config.llm_api_key, base_url=config.llm_base_url)
+
+    # The SMTP connection is reused for the whole run and closed afterwards
+    async with llm_client as aclient:
+        with EmailSender(config) as email_sender:
+            await _run_daily_task(config, email_sender, aclient, from_date, to_date, days_back)
+
+
+async def _run_daily_task(
+    config: Config,
+    email_sender: EmailSender,
+    aclient: AsyncOpenAI,
+    from_date: str,
+    to_date: str,
+    days_back: int,
+):
+    """Search, filter, summarize and send papers with an open email sender and LLM client"""
+    # Blocking network steps (SMTP, OpenAlex) run in worker threads so the
+    # event loop stays free for the scheduler and the LLM requests
+
     # Test email connection
     print(f"\n[PaperSeeker] Testing email server connection...")
-    email_sender = EmailSender(config)
-    try:
-        import socket
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(10)
-        sock.connect((config.smtp_server, config.smtp_port))
-        sock.close()
-        print(f"[PaperSeeker] Email server is reachable.")
-    except Exception as e:
-        print(f"[PaperSeeker] Email connection failed: {e}")
+    if not await asyncio.to_thread(email_sender.ping):
         print("[PaperSeeker] Aborting task. Please check your network or SMTP settings.")
         return
+    print(f"[PaperSeeker] Email server is reachable.")
 
     print(f"\n[PaperSeeker] Starting daily paper search...")
     print(f"[PaperSeeker] Keywords: {config.research_keywords[:3]}...")
 
-    # Search papers
-    searcher = OpenAlexSearcher(api_url=config.openalex_api_url)
-    papers = searcher.search(
+    # Search papers (merged newest first across keywords, duplicates removed)
+    searcher = OpenAlexSearcher(
+        api_url=config.openalex_api_url,
+        max_workers=config.openalex_max_workers,
+        mailto=config.openalex_mailto or None,
+        cache_path=config.openalex_cache_path or None,
+        cache_ttl=config.openalex_cache_ttl,
+    )
+    papers = await asyncio.to_thread(
+        searcher.search,
         keywords=config.research_keywords,
         exclude_keywords=config.exclude_keywords,
         days_back=days_back or config.days_back,
@@ -57,64 +95,57 @@ def daily_task(from_date: str = None, to_date: str = None, days_back: int = None
         from_date=from_date or config.from_date,
         to_date=to_date or config.to_date,
     )
+    papers_found = len(papers)
 
-    if not papers:
+    if not papers_found:
         print("[PaperSeeker] No papers found today.")
         return
 
-    print(f"\n[PaperSeeker] Found {len(papers)} papers, filtering...")
+    # With an API key the keyword filter is only a coarse pre-filter; it keeps the date order
+    keyword_filter = KeywordFilter(
+        keywords=config.research_keywords,
+        exclude_keywords=config.exclude_keywords,
+    )
+    keyword_threshold = 1 if config.llm_api_key else config.relevance_threshold
+    candidates = list(keyword_filter.iter_filter(papers, threshold=keyword_threshold))
+
+    print(f"\n[PaperSeeker] Found {papers_found} papers, {len(candidates)} matched keywords")
 
     # Filter papers (keyword pre-filter + AI refinement)
     if config.llm_api_key:
         print("[PaperSeeker] Using AI filter...")
-        filter_prompt = config.filter_prompt
         ai_filter = PaperFilter(
             provider=config.llm_provider,
             model=config.llm_model,
             api_key=config.llm_api_key,
             base_url=config.llm_base_url,
-            filter_prompt=filter_prompt,
-        )
-
-        # Quick keyword filter
-        keyword_filter = KeywordFilter(
-            keywords=config.research_keywords,
-            exclude_keywords=config.exclude_keywords,
+            filter_prompt=config.filter_prompt,
+            max_concurrency=config.llm_max_concurrency,
         )
-        candidates = keyword_filter.filter_batch(papers, threshold=1, show_progress=False)
-        print(f"  After keyword filter: {len(candidates)} candidates")
 
         # AI refinement
-        filtered_papers = ai_filter.filter_batch(
+        filtered_papers = await ai_filter.afilter_batch(
             candidates,
             threshold=config.relevance_threshold,
             show_progress=True,
+            aclient=aclient,
         )
     else:
         print("[PaperSeeker] Using keyword filter (no API key)...")
-        keyword_filter = KeywordFilter(
-            keywords=config.research_keywords,
-            exclude_keywords=config.exclude_keywords,
-        )
-        filtered_papers = keyword_filter.filter_batch(
-            papers,
-            threshold=config.relevance_threshold,
-            show_progress=True,
-        )
+        filtered_papers = candidates
 
     if not filtered_papers:
         print("\n[PaperSeeker] No relevant papers found today, sending notification email...")
         date_str = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-        email_sender = EmailSender(config)
-        email_sender.send_empty_result(date_str)
+        await asyncio.to_thread(email_sender.send_empty_result, date_str)
         return
 
     print(f"\n[PaperSeeker] {len(filtered_papers)} relevant papers, generating summaries...")
 
     # Generate summaries (only for high-score papers)
     summarize_threshold = config.summarize_threshold
-    papers_for_summary = [p for p in filtered_papers if p.get("relevance_score", 0) >= summarize_threshold]
-    papers_without_summary = [p for p in filtered_papers if p.get("relevance_score", 0) < summarize_threshold]
+    papers_for_summary = [p for p in filtered_papers if p.relevance_score >= summarize_threshold]
+    papers_without_summary = [p for p in filtered_papers if p.relevance_score < summarize_threshold]
 
     print(f"[PaperSeeker] Threshold: {summarize_threshold}, Papers for summary: {len(papers_for_summary)}, Without summary: {len(papers_without_summary)}")
 
@@ -127,32 +158,34 @@ def daily_task(from_date: str = None, to_date: str = None, days_back: int = None
             api_key=config.llm_api_key,
             base_url=config.llm_base_url,
             summarize_prompt=config.summarize_prompt,
+            max_concurrency=config.llm_max_concurrency,
+            cache_path=config.llm_summary_cache_path or None,
         )
         if papers_for_summary:
-            summarized = summarizer.summarize_batch(
+            summarized = await summarizer.asummarize_batch(
                 papers_for_summary,
                 show_progress=True,
+                aclient=aclient,
             )
             papers_with_summary.extend(summarized)
 
         # Low-score papers without summary
         for paper in papers_without_summary:
-            paper["summary_zh"] = "（相关性较低，仅保留基本信息）"
-            paper["summary_en"] = "(Low relevance, basic info only)"
+            paper.summary_zh = "（相关性较低，仅保留基本信息）"
+            paper.summary_en = "(Low relevance, basic info only)"
             papers_with_summary.append(paper)
     else:
         # No API key, use original abstract
         for paper in filtered_papers:
-            paper["summary_zh"] = paper.get("abstract", "")[:300] + "..."
-            paper["summary_en"] = "(No English summary available)"
+            paper.summary_zh = paper.abstract[:300] + "..."
+            paper.summary_en = "(No English summary available)"
         papers_with_summary = filtered_papers
 
     # Send email
     date_str = datetime.now().strftime("%Y-%m-%d")
     print(f"\n[PaperSeeker] Sending email for {len(papers_with_summary)} papers...")
 
-    email_sender = EmailSender(config)
-    success = email_sender.send(papers_with_summary, date_str)
+    success = await asyncio.to_thread(email_sender.send, papers_with_summary, date_str)
 
     if success:
         print(f"\n[PaperSeeker] Daily task completed! {len(papers_with_summary)} papers sent.")
@@ -202,8 +235,8 @@ def run_test():
             )
             for paper in test_papers[:2]:
                 result = ai_filter.filter_single(
-                    title=paper.get("title", ""),
-                    abstract=paper.get("abstract", ""),
+                    title=paper.title,
+                    abstract=paper.abstract,
                 )
                 print(f"  Score: {result['score']}, Reason: {result['reason']}")
 
@@ -237,8 +270,9 @@ def main():
 
     # Send test email
     if args.send_test_email:
-        email_sender = EmailSender(config)
-        if email_sender.send_test():
+        with EmailSender(config) as email_sender:
+            sent = email_sender.send_test()
+        if sent:
             print("Test email sent successfully!")
         else:
             print("Failed to send test email.")
@@ -260,7 +294,7 @@ def main():
 
     # Start scheduled task
     scheduler = PaperScheduler(
-        daily_task_func=daily_task,
+        daily_task_func=adaily_task,
         trigger_time=config.trigger_time,
     )
     scheduler.start(run_immediately=True)
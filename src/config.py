@@ -3,13 +3,79 @@ Configuration Management Module
 Loads settings from config.yaml and prompts.yaml
 """
 
+import copy
+import functools
 import os
+import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 from dotenv import load_dotenv
 
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml C extension
+except ImportError:
+    from yaml import SafeLoader
+
+_ENV_VAR_RE = re.compile(r"\$\{(\w+)\}")
+
+
+@functools.lru_cache(maxsize=8)
+def _read_yaml_cached(path: str, mtime: float) -> Tuple[str, Tuple[str, ...]]:
+    """Read a YAML file once per (path, mtime), with the ${VAR} names it uses"""
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    return content, tuple(sorted(set(_ENV_VAR_RE.findall(content))))
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_yaml_cached(path: str, mtime: float, env: Tuple[Tuple[str, str], ...]) -> Any:
+    """
+    Resolve environment variables and parse a YAML file
+
+    Cached per (path, mtime, referenced environment values), so a file is
+    only re-parsed after it or one of its variables changes.
+    """
+    content, _ = _read_yaml_cached(path, mtime)
+    values = dict(env)
+
+    # Resolve environment variables in a single pass
+    content = _ENV_VAR_RE.sub(lambda m: values[m.group(1)], content)
+
+    return yaml.load(content, Loader=SafeLoader)
+
+
+def _load_yaml_file(path: str) -> Dict[str, Any]:
+    """Load YAML file and resolve environment variables"""
+    mtime = os.path.getmtime(path)
+    _, names = _read_yaml_cached(path, mtime)
+    env = tuple((name, os.environ.get(name, "")) for name in names)
+
+    # Callers get their own copy, so the cached result is never mutated
+    return copy.deepcopy(_parse_yaml_cached(path, mtime, env))
+
+
+@functools.lru_cache(maxsize=8)
+def _find_file_cached(filename: str, cwd: str) -> str:
+    """Find file path, probing each candidate with a single stat"""
+    project_root = Path(__file__).parent.parent
+    possible_paths = [
+        Path(cwd) / filename,
+        project_root / filename,
+        project_root.parent / filename,
+    ]
+
+    for path in possible_paths:
+        try:
+            path.stat()
+        except OSError:
+            continue
+        return str(path)
+
+    raise FileNotFoundError(f"Cannot find {filename} in any of: {[str(p) for p in possible_paths]}")
+
 
 class Config:
     """Configuration management class"""
@@ -42,17 +108,7 @@ class Config:
 
     def _find_file(self, filename: str) -> str:
         """Find file path"""
-        possible_paths = [
-            Path.cwd() / filename,
-            Path(__file__).parent.parent / filename,
-            Path(__file__).parent.parent.parent / filename,
-        ]
-
-        for path in possible_paths:
-            if path.exists():
-                return str(path)
-
-        raise FileNotFoundError(f"Cannot find {filename} in any of: {[str(p) for p in possible_paths]}")
+        return _find_file_cached(filename, os.getcwd())
 
     def _resolve_env_vars(self, value: Any) -> Any:
         """Resolve environment variables in ${VAR_NAME} format"""
@@ -63,17 +119,7 @@ class Config:
 
     def _load_yaml(self, path: str) -> Dict[str, Any]:
         """Load YAML file and resolve environment variables"""
-        with open(path, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        # Resolve environment variables
-        import re
-        for match in re.finditer(r'\$\{(\w+)\}', content):
-            env_var = match.group(1)
-            env_value = os.environ.get(env_var, "")
-            content = content.replace(match.group(0), env_value)
-
-        return yaml.safe_load(content)
+        return _load_yaml_file(path)
 
     def load(self) -> None:
         """Load configuration files"""
@@ -85,138 +131,71 @@ class Config:
         if self.prompts_path and Path(self.prompts_path).exists():
             self._prompts = self._load_yaml(self.prompts_path)
 
-    # === Email Configuration ===
-    @property
-    def email(self) -> Dict[str, Any]:
-        return self._config.get("email", {})
+        self._resolve()
+
+    def _resolve(self) -> None:
+        """Resolve all settings into plain attributes once per load"""
+        env = os.environ
 
-    @property
-    def smtp_server(self) -> str:
+        # === Email Configuration ===
+        self.email: Dict[str, Any] = self._config.get("email", {})
         # Read from environment first, fallback to config
-        return os.environ.get("SMTP_SERVER", "") or self.email.get("smtp_server", "smtp.gmail.com")
-
-    @property
-    def smtp_port(self) -> int:
-        port = os.environ.get("SMTP_PORT", "")
-        if port:
-            return int(port)
-        return self.email.get("smtp_port", 587)
-
-    @property
-    def sender_email(self) -> str:
-        return os.environ.get("SENDER_EMAIL", "") or self.email.get("sender_email", "")
-
-    @property
-    def sender_password(self) -> str:
-        return os.environ.get("EMAIL_PASSWORD", "") or self.email.get("sender_password", "")
-
-    @property
-    def recipient_email(self) -> str:
-        return os.environ.get("RECIPIENT_EMAIL", "") or self.email.get("recipient_email", "")
-
-    # === OpenAlex Configuration ===
-    @property
-    def openalex(self) -> Dict[str, Any]:
-        return self._config.get("openalex", {})
-
-    @property
-    def openalex_api_url(self) -> str:
-        return self.openalex.get("api_url", "https://api.openalex.org")
-
-    # === LLM Configuration ===
-    @property
-    def llm(self) -> Dict[str, Any]:
-        return self._config.get("llm", {})
-
-    @property
-    def llm_provider(self) -> str:
-        return self.llm.get("provider", "openai")
-
-    @property
-    def llm_model(self) -> str:
-        return os.environ.get("LLM_MODEL", "") or self.llm.get("model", "DeepSeek-V3.2")
-
-    @property
-    def llm_api_key(self) -> str:
-        return os.environ.get("API_KEY", "") or self.llm.get("api_key", "")
-
-    @property
-    def llm_base_url(self) -> str:
-        return os.environ.get("LLM_BASE_URL", "") or self.llm.get("base_url", "")
-
-    # === Search Configuration ===
-    @property
-    def search(self) -> Dict[str, Any]:
-        return self._config.get("search", {})
-
-    @property
-    def max_results(self) -> int:
-        return self.search.get("max_results", 20)
-
-    @property
-    def days_back(self) -> int:
-        return self.search.get("days_back", 1)
-
-    @property
-    def relevance_threshold(self) -> int:
-        return self.search.get("relevance_threshold", 3)
-
-    @property
-    def from_date(self) -> Optional[str]:
-        """Start date (YYYY-MM-DD), takes priority over days_back"""
-        return self.search.get("from_date", None)
-
-    @property
-    def to_date(self) -> Optional[str]:
-        """End date (YYYY-MM-DD), defaults to today"""
-        return self.search.get("to_date", None)
-
-    # === Scheduler Configuration ===
-    @property
-    def scheduler(self) -> Dict[str, Any]:
-        return self._config.get("scheduler", {})
-
-    @property
-    def trigger_time(self) -> str:
-        return self.scheduler.get("trigger_time", "21:00")
-
-    @property
-    def scheduler_enabled(self) -> bool:
-        return self.scheduler.get("enabled", True)
-
-    # === Prompts Configuration ===
-    @property
-    def research_keywords(self) -> List[str]:
-        return self._prompts.get("research_keywords", [])
-
-    @property
-    def exclude_keywords(self) -> List[str]:
-        return self._prompts.get("exclude_keywords", [])
-
-    @property
-    def filter_prompt(self) -> str:
-        return self._prompts.get("filter_prompt", "")
-
-    @property
-    def summarize_prompt(self) -> str:
-        return self._prompts.get("summarize_prompt", "")
-
-    @property
-    def email_subject(self) -> str:
-        return self._prompts.get("email", {}).get("subject", "PaperSeeker: {date} Papers ({count})")
-
-    @property
-    def email_greeting(self) -> str:
-        return self._prompts.get("email", {}).get("greeting", "Hello, here are today's paper recommendations.")
-
-    @property
-    def email_footer(self) -> str:
-        return self._prompts.get("email", {}).get("footer", "")
-
-    @property
-    def summarize_threshold(self) -> int:
-        """Summary generation threshold"""
-        return self._prompts.get("summarize_threshold", 4)
+        self.smtp_server: str = env.get("SMTP_SERVER", "") or self.email.get("smtp_server", "smtp.gmail.com")
+        port = env.get("SMTP_PORT", "")
+        self.smtp_port: int = int(port) if port else self.email.get("smtp_port", 587)
+        self.sender_email: str = env.get("SENDER_EMAIL", "") or self.email.get("sender_email", "")
+        self.sender_password: str = env.get("EMAIL_PASSWORD", "") or self.email.get("sender_password", "")
+        self.recipient_email: str = env.get("RECIPIENT_EMAIL", "") or self.email.get("recipient_email", "")
+
+        # === OpenAlex Configuration ===
+        self.openalex: Dict[str, Any] = self._config.get("openalex", {})
+        self.openalex_api_url: str = self.openalex.get("api_url", "https://api.openalex.org")
+        # Contact email for OpenAlex's polite pool
+        self.openalex_mailto: str = env.get("OPENALEX_MAILTO", "") or self.openalex.get("mailto", "")
+        # Keywords searched concurrently
+        self.openalex_max_workers: int = self.openalex.get("max_workers", 4)
+        # On-disk response cache (needs requests-cache); empty disables it
+        self.openalex_cache_path: str = self.openalex.get("cache_path", ".cache/openalex")
+        self.openalex_cache_ttl: int = self.openalex.get("cache_ttl", 6 * 3600)
+
+        # === LLM Configuration ===
+        self.llm: Dict[str, Any] = self._config.get("llm", {})
+        self.llm_provider: str = self.llm.get("provider", "openai")
+        self.llm_model: str = env.get("LLM_MODEL", "") or self.llm.get("model", "DeepSeek-V3.2")
+        self.llm_api_key: str = env.get("API_KEY", "") or self.llm.get("api_key", "")
+        self.llm_base_url: str = env.get("LLM_BASE_URL", "") or self.llm.get("base_url", "")
+        # LLM requests in flight at once, bounded to respect provider rate limits
+        self.llm_max_concurrency: int = self.llm.get("max_concurrency", 8)
+        self.llm_summary_cache_path: str = self.llm.get("summary_cache_path", ".cache/summaries.db")
+
+        # === Search Configuration ===
+        self.search: Dict[str, Any] = self._config.get("search", {})
+        self.max_results: int = self.search.get("max_results", 20)
+        self.days_back: int = self.search.get("days_back", 1)
+        self.relevance_threshold: int = self.search.get("relevance_threshold", 3)
+        # Start date (YYYY-MM-DD), takes priority over days_back
+        self.from_date: Optional[str] = self.search.get("from_date", None)
+        # End date (YYYY-MM-DD), defaults to today
+        self.to_date: Optional[str] = self.search.get("to_date", None)
+
+        # === Scheduler Configuration ===
+        self.scheduler: Dict[str, Any] = self._config.get("scheduler", {})
+        self.trigger_time: str = self.scheduler.get("trigger_time", "21:00")
+        self.scheduler_enabled: bool = self.scheduler.get("enabled", True)
+
+        # === Prompts Configuration ===
+        self.research_keywords: List[str] = self._prompts.get("research_keywords", [])
+        self.exclude_keywords: List[str] = self._prompts.get("exclude_keywords", [])
+        self.filter_prompt: str = self._prompts.get("filter_prompt", "")
+        self.summarize_prompt: str = self._prompts.get("summarize_prompt", "")
+
+        email_prompts = self._prompts.get("email", {})
+        self.email_subject: str = email_prompts.get("subject", "PaperSeeker: {date} Papers ({count})")
+        self.email_greeting: str = email_prompts.get("greeting", "Hello, here are today's paper recommendations.")
+        self.email_footer: str = email_prompts.get("footer", "")
+
+        # Summary generation threshold
+        self.summarize_threshold: int = self._prompts.get("summarize_threshold", 4)
 
     def reload(self) -> None:
         """Reload configuration"""
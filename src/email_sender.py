@@ -5,11 +5,32 @@ Sends HTML formatted emails with paper recommendations
 
 import smtplib
 from datetime import datetime
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from typing import Any, Dict, List
+from email.message import EmailMessage
+from html import escape
+from typing import List, Optional
 
 from .config import Config
+from .paper import Paper
+
+# Socket timeout for SMTP connections (seconds)
+SMTP_TIMEOUT = 30
+
+# HTML card for a single paper, filled in with str.format
+_PAPER_CARD = """
+            <div class="paper-card">
+                <div class="paper-header">
+                    <span class="paper-number">{number}</span>
+                    <span class="score-badge" style="background: {score_color}">{score}</span>
+                    <h3 class="paper-title"><a href="{url}">{title}</a></h3>
+                </div>
+                <p class="paper-meta"><strong>{authors}</strong></p>
+                <p class="paper-meta">{journal}</p>
+                <div class="summary-section">
+                    <p class="summary-zh">{summary_zh}</p>
+                    <p class="summary-en">{summary_en}</p>
+                </div>
+            </div>
+            """
 
 
 class EmailSender:
@@ -29,7 +50,28 @@ class EmailSender:
         self.sender_password = config.sender_password
         self.recipient_email = config.recipient_email
 
-    def send(self, papers: List[Dict[str, Any]], date_str: str) -> bool:
+        # Cached SMTP connection, reused across sends until close()
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    def __enter__(self) -> "EmailSender":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the cached SMTP connection"""
+        if self._smtp is None:
+            return
+
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        finally:
+            self._smtp = None
+
+    def send(self, papers: List[Paper], date_str: str) -> bool:
         """
         Send paper recommendations email
 
@@ -60,6 +102,27 @@ class EmailSender:
         """
         return self._send_email(subject, html_content)
 
+    def ping(self) -> bool:
+        """
+        Check that the SMTP server is reachable and accepts our login
+
+        The connection is cached, so a following send reuses it.
+
+        Returns:
+            True if the server is ready (or email is not configured)
+        """
+        # Nothing to check: send() skips unconfigured email
+        if not self.sender_email or not self.recipient_email:
+            return True
+
+        try:
+            self._get_smtp()
+            return True
+
+        except Exception as e:
+            print(f"[Email] Connection failed: {e}")
+            return False
+
     def send_empty_result(self, date_str: str) -> bool:
         """Send notification when no relevant papers found"""
         subject = self.config.email_subject.format(date=date_str, count=0)
@@ -73,40 +136,31 @@ class EmailSender:
         """
         return self._send_email(subject, html_content)
 
-    def _build_html_content(self, papers: List[Dict[str, Any]], date_str: str) -> str:
+    def _build_html_content(self, papers: List[Paper], date_str: str) -> str:
         """Build HTML email content"""
         greeting = self.config.email_greeting
         footer = self.config.email_footer.replace("\n", "<br>")
 
-        paper_rows = ""
+        cards = []
         for i, paper in enumerate(papers, 1):
-            title = paper.get("title", "Untitled")
-            authors = paper.get("authors", "Unknown Authors")
-            journal = paper.get("journal", "Unknown Journal")
-            summary_zh = paper.get("summary_zh", "")
-            summary_en = paper.get("summary_en", "")
-            score = paper.get("relevance_score", 0)
-            reason = paper.get("relevance_reason", "")
-            openalex_url = paper.get("openalex_url", "")
+            score = paper.relevance_score
 
             # Generate color based on score
             score_color = "#4CAF50" if score >= 4 else "#2196F3" if score >= 3 else "#FF9800"
 
-            paper_rows += f"""
-            <div class="paper-card">
-                <div class="paper-header">
-                    <span class="paper-number">{i}</span>
-                    <span class="score-badge" style="background: {score_color}">{score}</span>
-                    <h3 class="paper-title"><a href="{openalex_url}">{title}</a></h3>
-                </div>
-                <p class="paper-meta"><strong>{authors}</strong></p>
-                <p class="paper-meta">{journal}</p>
-                <div class="summary-section">
-                    <p class="summary-zh">{summary_zh}</p>
-                    <p class="summary-en">{summary_en}</p>
-                </div>
-            </div>
-            """
+            cards.append(_PAPER_CARD.format(
+                number=i,
+                score_color=score_color,
+                score=score,
+                url=escape(paper.openalex_url),
+                title=escape(paper.title or "Untitled"),
+                authors=escape(paper.authors or "Unknown Authors"),
+                journal=escape(paper.journal or "Unknown Journal"),
+                summary_zh=escape(paper.summary_zh),
+                summary_en=escape(paper.summary_en),
+            ))
+
+        paper_rows = "".join(cards)
 
         html = f"""
         <!DOCTYPE html>
@@ -161,24 +215,52 @@ class EmailSender:
             True if successful
         """
         try:
-            msg = MIMEMultipart("alternative")
+            msg = EmailMessage()
             msg["Subject"] = subject
             msg["From"] = self.sender_email
             msg["To"] = self.recipient_email
 
-            # Add HTML part
-            html_part = MIMEText(html_content, "html", "utf-8")
-            msg.attach(html_part)
+            # Plain-text fallback plus the HTML alternative
+            msg.set_content("This email contains HTML content; please view it in an HTML-capable client.")
+            msg.add_alternative(html_content, subtype="html", cte="base64")
 
-            # Connect and send
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.sender_password)
-                server.sendmail(self.sender_email, self.recipient_email, msg.as_string())
+            # Send over the cached connection
+            self._get_smtp().send_message(msg)
 
             print(f"[Email] Sent: {subject}")
             return True
 
         except Exception as e:
+            # Drop a possibly broken connection so the next send reconnects
+            self.close()
             print(f"[Email] Failed to send: {e}")
             return False
+
+    def _get_smtp(self) -> smtplib.SMTP:
+        """
+        Get a logged-in SMTP connection
+
+        Reuses the cached connection while the server still answers NOOP,
+        otherwise opens a new one.
+
+        Returns:
+            Connected and authenticated SMTP object
+        """
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.close()
+
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=SMTP_TIMEOUT)
+        try:
+            server.starttls()
+            server.login(self.sender_email, self.sender_password)
+        except Exception:
+            server.close()
+            raise
+
+        self._smtp = server
+        return server
@@ -0,0 +1,68 @@
+"""
+LLM Batch Helpers
+Batched requests with a per-item fallback, shared by filter and summarizer
+"""
+
+import asyncio
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Sequence
+
+try:
+    from tqdm.asyncio import tqdm as async_tqdm
+except ImportError:
+    async_tqdm = None
+
+
+async def batch_with_fallback(
+    items: Sequence[Any],
+    request_batch: Callable[[Sequence[Any]], Awaitable[Dict[int, Any]]],
+    request_single: Callable[[Any], Awaitable[Any]],
+    label: str,
+) -> List[Any]:
+    """
+    Process items with one batched LLM request, falling back to one
+    request per item for anything the batch did not return
+
+    Args:
+        items: Items to process
+        request_batch: Coroutine function mapping the items to a dict of
+            item index to result; it may leave items out or raise
+        request_single: Coroutine function processing one item
+        label: Log prefix, e.g. "Filter"
+
+    Returns:
+        List of results, aligned with items
+    """
+    results: Dict[int, Any] = {}
+
+    if len(items) > 1:
+        try:
+            results = await request_batch(items)
+        except Exception as e:
+            print(f"[{label}] Batch request failed ({e}), retrying items individually")
+
+    missing = [i for i in range(len(items)) if i not in results]
+    if missing:
+        singles = await asyncio.gather(*[request_single(items[i]) for i in missing])
+        results.update(zip(missing, singles))
+
+    return [results[i] for i in range(len(items))]
+
+
+async def gather_with_progress(tasks: List[Awaitable[Any]], desc: str, show_progress: bool = False) -> List[Any]:
+    """
+    Await tasks concurrently, with a progress bar when requested
+
+    Args:
+        tasks: Awaitables to run
+        desc: Progress bar label
+        show_progress: Show progress bar
+
+    Returns:
+        List of results, aligned with tasks
+    """
+    # Progress bars only help on a terminal, not in scheduler logs
+    if show_progress and async_tqdm is not None and sys.stderr.isatty():
+        return await async_tqdm.gather(*tasks, desc=desc)
+
+    return await asyncio.gather(*tasks)
@@ -0,0 +1,36 @@
+"""
+Paper Model
+Paper record passed between search, filter, summarizer and email
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass(slots=True)
+class Paper:
+    """An OpenAlex work, plus the scores and summaries added along the way"""
+
+    id: str = ""
+    doi: str = ""
+    title: str = ""
+    publication_date: str = ""
+    journal: str = ""
+    authors: str = ""
+    abstract: str = ""
+    language: str = "en"
+    concepts: List[str] = field(default_factory=list)
+    keywords: List[str] = field(default_factory=list)
+    openalex_url: str = ""
+
+    # Set by the keyword/LLM filters
+    relevance_score: int = 0
+    relevance_reason: str = ""
+
+    # Set by the summarizer
+    summary_zh: str = ""
+    summary_en: str = ""
+
+    # Lowercased text KeywordFilter matches against, built on first use
+    search_text: Optional[str] = field(default=None, repr=False, compare=False)
+
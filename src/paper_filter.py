@@ -3,10 +3,132 @@ Paper Filter Module
 Keyword pre-filter + LLM refinement
 """
 
+import asyncio
+import json
 import re
-from typing import Any, Dict, List, Optional
+from contextlib import nullcontext
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern, Set
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+
+from .llm_batch import batch_with_fallback, gather_with_progress
+from .paper import Paper
+
+try:
+    import ahocorasick  # Optional: faster matching for long keyword lists
+except ImportError:
+    ahocorasick = None
+
+# Batches smaller than this are not worth a progress bar
+_MIN_PROGRESS_ITEMS = 5
+
+# Appended to the filter prompt when a single paper is scored in JSON mode
+_SINGLE_INSTRUCTION = """
+
+Respond with a JSON object: {"score": <1-5>, "reason": "<one short sentence>"}"""
+
+# Appended to the filter prompt when several papers are scored in one request
+_BATCH_INSTRUCTION = """
+
+You will receive a JSON array of papers, each with fields "i", "title" and "abstract".
+Rate every paper and return ONLY a JSON array with one object per paper:
+[{"i": <paper index>, "score": <1-5>, "reason": "<brief explanation>"}, ...]"""
+
+# Abstracts are truncated to this many characters before scoring
+_MAX_ABSTRACT_CHARS = 1200
+
+# Opt-in header for prompt caching on Anthropic-compatible endpoints
+_PROMPT_CACHING_HEADERS = {"anthropic-beta": "prompt-caching-2024-07-31"}
+
+# Fallback parsers for single-paper responses that are not valid JSON, such
+# as labelled text or a JSON object cut off by max_tokens; the Chinese and
+# English labels both appear depending on the prompt
+_SCORE_RE = re.compile(r"(?:评分|Score)\"?\s*[:：]?\s*(\d+)", re.IGNORECASE)
+_REASON_RE = re.compile(r"(?:理由|Reason)\"?\s*[:：]?\s*\"?(.+?)(?:\"\s*\}?)?\s*$", re.IGNORECASE | re.DOTALL)
+
+
+def _compile_keywords(keywords: List[str]) -> Optional[Pattern]:
+    """Compile lowercase keywords into one whole-word alternation"""
+    if not keywords:
+        return None
+
+    # Longest first, so a keyword is not shadowed by one of its prefixes;
+    # the lookahead lets matches overlap, e.g. "electric truck" and "truck battery"
+    alternatives = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    return re.compile(r"(?=\b(" + alternatives + r")\b)")
+
+
+def _is_boundary(text: str, i: int) -> bool:
+    """Whether position i in text is a word boundary, as regex \\b"""
+    before = i > 0 and (text[i - 1].isalnum() or text[i - 1] == "_")
+    after = i < len(text) and (text[i].isalnum() or text[i] == "_")
+    return before != after
+
+
+class _KeywordMatcher:
+    """Finds which keywords occur in a text as whole words
+
+    Uses an Aho-Corasick automaton when pyahocorasick is installed, which
+    reports every keyword in a single pass of the text, and falls back to
+    a compiled regex alternation otherwise. The regex reports only the
+    longest keyword at each position, so shorter keywords that are prefixes
+    of it are checked separately.
+    """
+
+    def __init__(self, keywords: List[str]):
+        self.size = len(set(keywords))
+        self._automaton = None
+        self._pattern = None
+        self._prefixes: Dict[str, List[str]] = {}
+
+        if keywords and ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            self._pattern = _compile_keywords(keywords)
+            unique = set(keywords)
+            self._prefixes = {
+                keyword: [k for k in unique if k != keyword and keyword.startswith(k)]
+                for keyword in unique
+            }
+
+    def hits(self, text: str, limit: Optional[int] = None) -> Set[str]:
+        """
+        Get the distinct keywords found in lowercased text
+
+        Args:
+            text: Lowercased text to search
+            limit: Stop scanning once this many distinct keywords are found
+
+        Returns:
+            Set of matched keywords
+        """
+        if limit is None or limit > self.size:
+            limit = self.size
+
+        found: Set[str] = set()
+        if limit <= 0:
+            return found
+
+        if self._automaton is not None:
+            for end, keyword in self._automaton.iter(text):
+                if _is_boundary(text, end - len(keyword) + 1) and _is_boundary(text, end + 1):
+                    found.add(keyword)
+                    if len(found) >= limit:
+                        break
+
+        elif self._pattern is not None:
+            for match in self._pattern.finditer(text):
+                keyword = match.group(1)
+                start = match.start()
+                found.add(keyword)
+                found.update(k for k in self._prefixes[keyword] if _is_boundary(text, start + len(k)))
+                if len(found) >= limit:
+                    break
+
+        return found
 
 
 class KeywordFilter:
@@ -27,12 +149,15 @@ class KeywordFilter:
         self.keywords = [k.lower() for k in keywords]
         self.exclude_keywords = [k.lower() for k in (exclude_keywords or [])]
 
+        self._kw_matcher = _KeywordMatcher(self.keywords)
+        self._excl_matcher = _KeywordMatcher(self.exclude_keywords)
+
     def filter_batch(
         self,
-        papers: List[Dict[str, Any]],
+        papers: List[Paper],
         threshold: int = 3,
         show_progress: bool = False,
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Paper]:
         """
         Filter a batch of papers
 
@@ -44,47 +169,65 @@ class KeywordFilter:
         Returns:
             Filtered list of papers
         """
-        filtered = []
+        return list(self.iter_filter(papers, threshold))
+
+    def iter_filter(
+        self,
+        papers: Iterable[Paper],
+        threshold: int = 3,
+    ) -> Iterator[Paper]:
+        """
+        Lazily filter papers, so scoring can overlap with a streaming search
+
+        Args:
+            papers: Iterable of papers
+            threshold: Minimum keyword match count
+
+        Yields:
+            Papers meeting the threshold, with relevance_score set
+        """
+        score_paper = self._score_paper
         for paper in papers:
-            score = self._score_paper(paper)
+            score = score_paper(paper, threshold)
             if score >= threshold:
-                paper["relevance_score"] = score
-                filtered.append(paper)
+                paper.relevance_score = score
+                yield paper
 
-        return filtered
+    def _score_paper(self, paper: Paper, threshold: Optional[int] = None) -> int:
+        """
+        Score paper based on keyword matching
 
-    def _score_paper(self, paper: Dict[str, Any]) -> int:
-        """Score paper based on keyword matching"""
-        text = self._get_text(paper).lower()
-        score = 0
+        Args:
+            paper: Paper
+            threshold: Minimum score the caller accepts; papers whose exclude
+                penalty already rules this out score 0 without a keyword scan
 
-        for keyword in self.keywords:
-            if keyword in text:
-                score += 1
+        Returns:
+            Keyword score
+        """
+        text = self._get_text(paper)
+        max_score = self._kw_matcher.size
+
+        # Exclude keywords first: the list is short and a large enough
+        # penalty settles the outcome before the keyword scan
+        limit = None
+        if threshold is not None:
+            limit = max(0, max_score - threshold) // 2 + 1
+        excluded = len(self._excl_matcher.hits(text, limit=limit))
+        if limit is not None and excluded >= limit:
+            return 0
 
         # Penalty for exclude keywords
-        for keyword in self.exclude_keywords:
-            if keyword in text:
-                score = max(0, score - 2)
-
-        return score
-
-    def _get_text(self, paper: Dict[str, Any]) -> str:
-        """Get searchable text from paper"""
-        parts = [
-            paper.get("title", ""),
-            paper.get("abstract", ""),
-            paper.get("journal", ""),
-        ]
-
-        # Add authors and concepts
-        concepts = paper.get("concepts", [])
-        if isinstance(concepts, list):
-            if concepts and isinstance(concepts[0], dict):
-                concepts = [c.get("display_name", "") for c in concepts]
-            parts.extend(concepts)
+        score = len(self._kw_matcher.hits(text))
+        return max(0, score - 2 * excluded)
 
-        return " ".join(str(p) for p in parts)
+    def _get_text(self, paper: Paper) -> str:
+        """Get lowercased searchable text from paper, cached on the paper"""
+        text = paper.search_text
+        if text is None:
+            text = " ".join([paper.title, paper.abstract, paper.journal, *paper.concepts]).lower()
+            paper.search_text = text
+        return text
 
 
 class PaperFilter:
@@ -97,6 +240,8 @@ class PaperFilter:
         api_key: str = "",
         base_url: str = "",
         filter_prompt: str = "",
+        batch_size: int = 10,
+        max_concurrency: int = 8,
     ):
         """
         Initialize LLM filter
@@ -107,22 +252,27 @@ class PaperFilter:
             api_key: API key
             base_url: API base URL
             filter_prompt: System prompt for filtering
+            batch_size: Number of papers scored per LLM request
+            max_concurrency: Maximum number of LLM requests in flight
         """
         self.provider = provider
         self.model = model
         self.filter_prompt = filter_prompt
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
 
-        if api_key:
-            self.client = OpenAI(api_key=api_key, base_url=base_url)
-        else:
-            self.client = None
+        self._api_key = api_key
+        self._base_url = base_url
+
+        # Sync client for filter_single; batch filtering uses an async client
+        self.client = OpenAI(api_key=api_key, base_url=base_url) if api_key else None
 
     def filter_batch(
         self,
-        papers: List[Dict[str, Any]],
+        papers: List[Paper],
         threshold: int = 3,
         show_progress: bool = False,
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Paper]:
         """
         Filter papers using LLM
 
@@ -134,28 +284,47 @@ class PaperFilter:
         Returns:
             Filtered list of papers with scores
         """
-        if not self.client:
+        return asyncio.run(self.afilter_batch(papers, threshold, show_progress))
+
+    async def afilter_batch(
+        self,
+        papers: List[Paper],
+        threshold: int = 3,
+        show_progress: bool = False,
+        aclient: Optional[AsyncOpenAI] = None,
+    ) -> List[Paper]:
+        """
+        Filter papers using LLM, inside a running event loop
+
+        Args:
+            papers: List of papers
+            threshold: Minimum relevance score
+            show_progress: Show progress bar
+            aclient: Async client to share with other LLM steps; when None
+                a client scoped to this call is opened
+
+        Returns:
+            Filtered list of papers with scores
+        """
+        if not self._api_key:
             print("[Filter] No API key configured, skipping LLM filter")
             return papers
 
-        filtered = []
-        iterator = papers
-
-        if show_progress:
-            from tqdm import tqdm
-            iterator = tqdm(iterator, desc="AI Filtering")
+        chunks = [papers[i:i + self.batch_size] for i in range(0, len(papers), self.batch_size)]
+        show_progress = show_progress and len(papers) >= _MIN_PROGRESS_ITEMS
 
-        for paper in iterator:
-            result = self.filter_single(
-                title=paper.get("title", ""),
-                abstract=paper.get("abstract", ""),
-            )
+        # A client of our own must not outlive this call's event loop
+        async with nullcontext(aclient) if aclient else self._async_client() as client:
+            results = await self._ascore_chunks(client, chunks, show_progress)
 
-            score = result.get("score", 0)
-            if score >= threshold:
-                paper["relevance_score"] = score
-                paper["relevance_reason"] = result.get("reason", "")
-                filtered.append(paper)
+        filtered = []
+        for chunk, chunk_results in zip(chunks, results):
+            for paper, result in zip(chunk, chunk_results):
+                score = result.get("score", 0)
+                if score >= threshold:
+                    paper.relevance_score = score
+                    paper.relevance_reason = result.get("reason", "")
+                    filtered.append(paper)
 
         return filtered
 
@@ -178,27 +347,161 @@ class PaperFilter:
             return {"score": 3, "reason": "No API key"}
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.filter_prompt},
-                    {"role": "user", "content": f"标题：{title}\n\n摘要：{abstract[:2000]}"},
-                ],
-                temperature=0.3,
-                max_tokens=200,
-            )
+            response = self.client.chat.completions.create(**self._single_request(title, abstract))
+            return self._parse_single(response.choices[0].message.content or "")
+
+        except Exception as e:
+            print(f"[Filter] Error: {e}")
+            return {"score": 3, "reason": f"Error: {e}"}
+
+    def _async_client(self) -> AsyncOpenAI:
+        """Create an async client with this filter's credentials"""
+        return AsyncOpenAI(api_key=self._api_key, base_url=self._base_url)
+
+    async def _ascore_chunks(
+        self,
+        aclient: AsyncOpenAI,
+        chunks: List[List[Paper]],
+        show_progress: bool = False,
+    ) -> List[List[Dict[str, Any]]]:
+        """Score all chunks concurrently, bounded by max_concurrency"""
+        sem = asyncio.Semaphore(self.max_concurrency)
+        tasks = [self._ascore_chunk(aclient, chunk, sem) for chunk in chunks]
+        return await gather_with_progress(tasks, "AI Filtering", show_progress)
+
+    async def _ascore_chunk(
+        self,
+        aclient: AsyncOpenAI,
+        papers: List[Paper],
+        sem: asyncio.Semaphore,
+    ) -> List[Dict[str, Any]]:
+        """
+        Score a chunk of papers in one LLM request, re-scoring skipped papers one by one
 
-            content = response.choices[0].message.content or ""
+        Returns:
+            List of dicts with 'score' and 'reason', aligned with papers
+        """
+        async def score_batch(batch: List[Paper]) -> Dict[int, Dict[str, Any]]:
+            async with sem:
+                response = await aclient.chat.completions.create(**self._batch_request(batch))
+            return self._parse_many(response.choices[0].message.content or "", len(batch))
 
-            # Parse response
-            score_match = re.search(r"评分[:：]?\s*(\d+)", content)
-            reason_match = re.search(r"理由[:：]?\s*(.+)", content)
+        async def score_single(paper: Paper) -> Dict[str, Any]:
+            return await self._ascore(aclient, paper, sem)
 
-            score = int(score_match.group(1)) if score_match else 3
-            reason = reason_match.group(1).strip() if reason_match else content
+        return await batch_with_fallback(papers, score_batch, score_single, "Filter")
 
-            return {"score": score, "reason": reason}
+    async def _ascore(
+        self,
+        aclient: AsyncOpenAI,
+        paper: Paper,
+        sem: asyncio.Semaphore,
+    ) -> Dict[str, Any]:
+        """Async counterpart of filter_single for a Paper"""
+        try:
+            async with sem:
+                response = await aclient.chat.completions.create(
+                    **self._single_request(paper.title, paper.abstract)
+                )
+            return self._parse_single(response.choices[0].message.content or "")
 
         except Exception as e:
             print(f"[Filter] Error: {e}")
             return {"score": 3, "reason": f"Error: {e}"}
+
+    def _single_request(self, title: str, abstract: str) -> Dict[str, Any]:
+        """Build chat completion arguments for scoring one paper"""
+        return self._request(
+            system=self.filter_prompt + _SINGLE_INSTRUCTION,
+            user=f"标题：{title}\n\n摘要：{abstract[:_MAX_ABSTRACT_CHARS]}",
+            max_tokens=200,
+            json_mode=True,
+        )
+
+    def _batch_request(self, papers: List[Paper]) -> Dict[str, Any]:
+        """Build chat completion arguments for scoring several papers at once"""
+        items = [
+            {"i": i, "title": paper.title, "abstract": paper.abstract[:_MAX_ABSTRACT_CHARS]}
+            for i, paper in enumerate(papers)
+        ]
+        return self._request(
+            system=self.filter_prompt + _BATCH_INSTRUCTION,
+            user=json.dumps(items, ensure_ascii=False),
+            max_tokens=200 * len(papers),
+        )
+
+    def _request(self, system: str, user: str, max_tokens: int, json_mode: bool = False) -> Dict[str, Any]:
+        """
+        Build chat completion arguments around a shared system prompt
+
+        The system prompt is identical across requests, so OpenAI-compatible
+        providers can serve it from their automatic prefix cache; Anthropic
+        endpoints need it marked for caching explicitly.
+
+        Args:
+            system: System prompt
+            user: User message
+            max_tokens: Output token budget
+            json_mode: Ask the provider for a single JSON object response
+        """
+        request: Dict[str, Any] = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            "temperature": 0.3,
+            "max_tokens": max_tokens,
+        }
+
+        if self.provider == "anthropic":
+            request["messages"][0]["content"] = [
+                {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}},
+            ]
+            request["extra_headers"] = _PROMPT_CACHING_HEADERS
+
+        if json_mode:
+            request["response_format"] = {"type": "json_object"}
+
+        return request
+
+    def _parse_single(self, content: str) -> Dict[str, Any]:
+        """Parse a single-paper scoring response"""
+        try:
+            data = json.loads(content)
+            return {"score": int(data["score"]), "reason": str(data.get("reason", ""))}
+        except (ValueError, KeyError, TypeError):
+            pass
+
+        # Not JSON, fall back to the labelled text format
+        score_match = _SCORE_RE.search(content)
+        reason_match = _REASON_RE.search(content)
+
+        score = int(score_match.group(1)) if score_match else 3
+        reason = reason_match.group(1).strip() if reason_match else content
+
+        return {"score": score, "reason": reason}
+
+    def _parse_many(self, content: str, count: int) -> Dict[int, Dict[str, Any]]:
+        """
+        Parse a batched scoring response
+
+        Args:
+            content: Model response containing a JSON array
+            count: Number of papers in the request
+
+        Returns:
+            Dict mapping paper index to 'score' and 'reason'
+        """
+        # Tolerate markdown code fences around the array
+        start, end = content.find("["), content.rfind("]")
+        if start == -1 or end < start:
+            raise ValueError("no JSON array in response")
+
+        scored = {}
+        for entry in json.loads(content[start:end + 1]):
+            i = int(entry["i"])
+            if 0 <= i < count:
+                scored[i] = {"score": int(entry["score"]), "reason": str(entry.get("reason", ""))}
+
+        return scored
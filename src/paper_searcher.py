@@ -3,29 +3,186 @@ OpenAlex Paper Search Module
 Searches academic papers from OpenAlex API
 """
 
+import heapq
+import json
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 import requests
-from tqdm import tqdm
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .paper import Paper
+
+try:
+    from orjson import dumps as json_dumps, loads as json_loads  # Optional: faster JSON
+except ImportError:
+    from json import dumps as json_dumps, loads as json_loads
+
+try:
+    import ijson  # Optional: parse REST result pages while they download
+    JSON_ERRORS = (ValueError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    JSON_ERRORS = (ValueError,)
+
+try:
+    import requests_cache  # Optional: on-disk cache of OpenAlex responses
+except ImportError:
+    requests_cache = None
+
+# GraphQL works query ({{ }} are literal braces for str.format)
+GRAPHQL_QUERY_TEMPLATE = """
+{{
+    works(
+        search: "{keyword}",
+        filter: "from_publication_date:{from_date},to_publication_date:{to_date}",
+        sort: "publication_date:desc",
+        per_page: {per_page}
+    ) {{
+        results {{
+            id
+            doi
+            title
+            publication_date
+            publication_year
+            journal {{
+                id
+                display_name
+            }}
+            authorships {{
+                author {{
+                    id
+                    display_name
+                }}
+            }}
+            abstract
+            language
+            keywords {{
+                id
+                display_name
+            }}
+            concepts {{
+                id
+                display_name
+                level
+            }}
+        }}
+    }}
+}}
+""".strip()
+
+# Work fields requested from the REST API
+REST_SELECT_FIELDS = ",".join([
+    "id",
+    "doi",
+    "title",
+    "publication_date",
+    "authorships",
+    "abstract_inverted_index",
+    "language",
+    "concepts",
+    "keywords",
+    "primary_location",
+])
+
+
+# Sort key: YYYY-MM-DD strings sort chronologically
+_publication_date = attrgetter("publication_date")
+
+
+class _RateLimiter:
+    """Thread-safe token bucket shared by the keyword worker threads"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping only when the bucket is empty"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
 
 
 class OpenAlexSearcher:
     """OpenAlex API paper search"""
 
-    def __init__(self, api_url: str = "https://api.openalex.org"):
+    def __init__(
+        self,
+        api_url: str = "https://api.openalex.org",
+        max_workers: int = 4,
+        mailto: Optional[str] = None,
+        cache_path: Optional[str] = None,
+        cache_ttl: int = 6 * 3600,
+        requests_per_second: float = 8.0,
+    ):
         """
         Initialize searcher
 
         Args:
             api_url: OpenAlex API base URL
+            max_workers: Maximum number of keywords searched concurrently
+            mailto: Contact email for OpenAlex's polite pool (higher rate limits)
+            cache_path: On-disk response cache location, used when
+                requests-cache is installed; None disables caching
+            cache_ttl: Seconds a cached response stays valid
+            requests_per_second: Request rate shared by all workers
+                (OpenAlex allows 10/s); 429s are still retried by the adapter
         """
         self.api_url = api_url.rstrip("/")
-        self.session = requests.Session()
+        self.max_workers = max(1, max_workers)
+        self.mailto = mailto
+        self.rate_limiter = _RateLimiter(requests_per_second)
+
+        cached = bool(cache_path) and requests_cache is not None
+        if cached:
+            # Keys cover URL and body, so GraphQL POSTs are cached too
+            self.session = requests_cache.CachedSession(
+                cache_path,
+                expire_after=cache_ttl,
+                allowable_methods=("GET", "POST"),
+            )
+        else:
+            self.session = requests.Session()
+
+        # Cached responses cannot be re-read from the raw stream, so REST
+        # pages are only stream-parsed on an uncached session
+        self.stream_rest = ijson is not None and not cached
+
         self.session.headers.update({
             "User-Agent": "PaperSeeker/1.0",
             "Accept": "application/json",
         })
+        if mailto:
+            self.session.params["mailto"] = mailto
+
+        # Retry transient failures with backoff, honoring Retry-After on 429/503
+        retry = Retry(
+            total=5,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "POST"],
+            respect_retry_after_header=True,
+        )
+
+        # Keep enough pooled connections for every worker thread
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=8, pool_maxsize=max(8, self.max_workers))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def search(
         self,
@@ -36,7 +193,7 @@ class OpenAlexSearcher:
         from_date: Optional[str] = None,
         to_date: Optional[str] = None,
         verbose: bool = False,
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Paper]:
         """
         Search papers by keywords
 
@@ -50,56 +207,134 @@ class OpenAlexSearcher:
             verbose: Verbose output
 
         Returns:
-            List of paper dictionaries
+            List of papers
         """
-        # Calculate date filter
-        if from_date:
-            from_dt = from_date
-        else:
-            from_dt = self._days_ago(days_back)
+        from_dt, to_dt = self._date_range(days_back, from_date, to_date)
 
-        if to_date:
-            to_dt = to_date
-        else:
-            from_dt = self._days_ago(days_back)  # Refresh from_dt
+        if verbose:
+            print(f"[Searcher] Searching from {from_dt} to {to_dt}...")
 
-        all_papers = []
-        seen_ids = set()
+        per_keyword_results = []
+        for keyword, papers in self._iter_keyword_results(keywords, from_dt, to_dt, max_results):
+            # OpenAlex already sorts by date; this is a linear pass that only
+            # guards against fallback responses that are out of order
+            papers.sort(key=_publication_date, reverse=True)
+            per_keyword_results.append(papers)
+            if verbose:
+                print(f"  Keyword '{keyword}': found {len(papers)} papers")
+
+        # Merge the sorted per-keyword lists (newest first), skipping duplicates
+        is_new = self._duplicate_checker()
+        all_papers = [
+            paper
+            for paper in heapq.merge(*per_keyword_results, key=_publication_date, reverse=True)
+            if is_new(paper)
+        ]
 
         if verbose:
-            print(f"[Searcher] Searching from {from_dt} to {to_dt}...")
+            print(f"[Searcher] Total: {len(all_papers)} unique papers")
 
-        for keyword in keywords:
-            papers = self._search_single_keyword(
-                keyword,
-                from_date=from_dt,
-                to_date=to_dt,
-                max_results=max_results,
-            )
+        return all_papers
 
-            # Remove duplicates
-            new_papers = []
-            for paper in papers:
-                paper_id = paper.get("id", "")
-                if paper_id and paper_id not in seen_ids:
-                    seen_ids.add(paper_id)
-                    new_papers.append(paper)
+    def iter_search(
+        self,
+        keywords: List[str],
+        exclude_keywords: Optional[List[str]] = None,
+        days_back: int = 7,
+        max_results: int = 20,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        verbose: bool = False,
+    ) -> Iterator[Paper]:
+        """
+        Search papers by keywords, yielding each unique paper as its
+        keyword's results arrive (not sorted across keywords)
 
-            all_papers.extend(new_papers)
+        Args:
+            keywords: List of research keywords
+            exclude_keywords: Keywords to exclude
+            days_back: Search recent N days (used if from_date not specified)
+            max_results: Maximum results per keyword
+            from_date: Start date (YYYY-MM-DD)
+            to_date: End date (YYYY-MM-DD)
+            verbose: Verbose output
+
+        Yields:
+            Papers
+        """
+        from_dt, to_dt = self._date_range(days_back, from_date, to_date)
+
+        if verbose:
+            print(f"[Searcher] Searching from {from_dt} to {to_dt}...")
+
+        is_new = self._duplicate_checker()
+        for keyword, papers in self._iter_keyword_results(keywords, from_dt, to_dt, max_results):
+            new_count = 0
+            for paper in papers:
+                if is_new(paper):
+                    new_count += 1
+                    yield paper
 
             if verbose:
-                print(f"  Keyword '{keyword}': found {len(papers)} papers ({len(new_papers)} new)")
+                print(f"  Keyword '{keyword}': found {len(papers)} papers ({new_count} new)")
+
+    def _date_range(
+        self,
+        days_back: int,
+        from_date: Optional[str],
+        to_date: Optional[str],
+    ) -> Tuple[str, str]:
+        """Resolve the (from, to) publication date filter"""
+        from_dt = from_date or self._days_ago(days_back)
+        to_dt = to_date or datetime.now().strftime("%Y-%m-%d")
+        return from_dt, to_dt
+
+    def _iter_keyword_results(
+        self,
+        keywords: List[str],
+        from_date: str,
+        to_date: str,
+        max_results: int,
+    ) -> Iterator[Tuple[str, List[Paper]]]:
+        """Search keywords concurrently, yielding (keyword, papers) as each completes"""
+        # Requests pass through the shared rate limiter, so no sleep
+        # between keywords is needed
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, max(1, len(keywords)))) as executor:
+            futures = {
+                executor.submit(
+                    self._search_single_keyword,
+                    keyword,
+                    from_date=from_date,
+                    to_date=to_date,
+                    max_results=max_results,
+                ): keyword
+                for keyword in keywords
+            }
+
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def _duplicate_checker(self) -> Callable[[Paper], bool]:
+        """Return a predicate that is True the first time a paper is seen"""
+        seen_ids = set()
+        seen_titles = set()
 
-            # Rate limiting
-            time.sleep(0.5)
+        def is_new(paper: Paper) -> bool:
+            paper_id = paper.id
+            if not paper_id or paper_id in seen_ids:
+                return False
+            seen_ids.add(paper_id)
 
-        # Sort by publication date (newest first)
-        all_papers.sort(key=lambda x: x.get("publication_date", ""), reverse=True)
+            # The same work is sometimes indexed under several IDs
+            title_key = self._title_key(paper)
+            if title_key:
+                if title_key in seen_titles:
+                    return False
+                seen_titles.add(title_key)
 
-        if verbose:
-            print(f"[Searcher] Total: {len(all_papers)} unique papers")
+            return True
 
-        return all_papers
+        return is_new
 
     def _search_single_keyword(
         self,
@@ -107,7 +342,7 @@ class OpenAlexSearcher:
         from_date: str,
         to_date: str,
         max_results: int = 100,
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Paper]:
         """
         Search papers for a single keyword
 
@@ -118,56 +353,24 @@ class OpenAlexSearcher:
             max_results: Maximum results
 
         Returns:
-            List of paper dictionaries
-        """
-        # Build query
-        query = f"""
-            {{
-                works(
-                    search: "{keyword}",
-                    filter: "from_publication_date:{from_date},to_publication_date:{to_date}",
-                    sort: "publication_date:desc",
-                    per_page: {min(max_results, 100)}
-                ) {{
-                    results {{
-                        id
-                        doi
-                        title
-                        publication_date
-                        publication_year
-                        journal {{
-                            id
-                            display_name
-                        }}
-                        authorships {{
-                            author {{
-                                id
-                                display_name
-                            }}
-                        }}
-                        abstract
-                        language
-                        keywords {{
-                            id
-                            display_name
-                        }}
-                        concepts {{
-                            id
-                            display_name
-                            level
-                        }}
-                    }}
-                }}
-            }}
+            List of papers
         """
+        # Build query; the keyword is JSON-escaped so quotes cannot break it
+        query = GRAPHQL_QUERY_TEMPLATE.format(
+            keyword=json.dumps(keyword)[1:-1],
+            from_date=from_date,
+            to_date=to_date,
+            per_page=min(max_results, 100),
+        )
 
         url = f"{self.api_url}/graphql"
         headers = {"Content-Type": "application/json"}
 
         try:
-            response = self.session.post(url, json={"query": query.strip()}, timeout=30)
+            self.rate_limiter.acquire()
+            response = self.session.post(url, data=json_dumps({"query": query}), headers=headers, timeout=30)
             response.raise_for_status()
-            data = response.json()
+            data = json_loads(response.content)
 
             works = data.get("data", {}).get("works", {}).get("results", [])
 
@@ -178,7 +381,7 @@ class OpenAlexSearcher:
 
             return [self._parse_work(work) for work in works]
 
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             print(f"[Searcher] Error searching '{keyword}': {e}")
             return self._search_rest_api(keyword, from_date, to_date, max_results)
 
@@ -188,7 +391,7 @@ class OpenAlexSearcher:
         from_date: str,
         to_date: str,
         max_results: int = 100,
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Paper]:
         """
         Fallback: Search using REST API
 
@@ -199,7 +402,7 @@ class OpenAlexSearcher:
             max_results: Maximum results
 
         Returns:
-            List of paper dictionaries
+            List of papers
         """
         url = f"{self.api_url}/works"
         params = {
@@ -207,60 +410,87 @@ class OpenAlexSearcher:
             "filter": f"from_publication_date:{from_date},to_publication_date:{to_date}",
             "sort": "publication_date:desc",
             "per-page": min(max_results, 100),
+            # Only fetch the fields _parse_work reads, which shrinks each page
+            "select": REST_SELECT_FIELDS,
         }
 
         try:
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-
-            results = data.get("results", [])
-            return [self._parse_work(work) for work in results]
-
-        except requests.exceptions.RequestException as e:
+            self.rate_limiter.acquire()
+            with self.session.get(url, params=params, timeout=30, stream=self.stream_rest) as response:
+                response.raise_for_status()
+
+                if self.stream_rest:
+                    # Parse each work as it arrives instead of buffering the page
+                    response.raw.decode_content = True
+                    results = ijson.items(response.raw, "results.item", use_float=True)
+                    return [self._parse_work(work) for work in results]
+
+                data = json_loads(response.content)
+                results = data.get("results", [])
+                return [self._parse_work(work) for work in results]
+
+        # A stream cut mid-body raises urllib3 errors, not requests ones
+        except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError, *JSON_ERRORS) as e:
             print(f"[Searcher] REST API error for '{keyword}': {e}")
             return []
 
-    def _parse_work(self, work: Dict[str, Any]) -> Dict[str, Any]:
+    def _parse_work(self, work: Dict[str, Any]) -> Paper:
         """Parse OpenAlex work to simplified format"""
-        # Extract authors
-        authors = []
-        for authorship in work.get("authorships", []):
-            author = authorship.get("author", {})
-            if author:
-                authors.append(author.get("display_name", ""))
-
-        # Extract journal/conference
-        host = work.get("journal", {})
+        get = work.get
+
+        authors = [
+            author.get("display_name", "")
+            for ship in get("authorships") or ()
+            if (author := ship.get("author"))
+        ]
+
+        # Journal/conference (GraphQL: journal, REST: primary_location.source)
+        host = get("journal") or (get("primary_location") or {}).get("source")
         journal = host.get("display_name", "") if host else ""
 
-        # Extract concepts/topics
-        concepts = []
-        for concept in work.get("concepts", []):
-            if concept.get("level", 0) == 0:  # Top-level concepts
-                concepts.append(concept.get("display_name", ""))
-
-        # Extract keywords
-        keywords = []
-        for kw in work.get("keywords", []):
-            keywords.append(kw.get("display_name", ""))
-
-        return {
-            "id": work.get("id", "").split("/")[-1] if work.get("id") else "",
-            "doi": work.get("doi", ""),
-            "title": work.get("title", ""),
-            "publication_date": work.get("publication_date", ""),
-            "journal": journal,
-            "authors": ", ".join(authors[:5]),  # Limit to 5 authors
-            "abstract": work.get("abstract", ""),
-            "language": work.get("language", "en"),
-            "concepts": concepts,
-            "keywords": keywords,
-            "openalex_url": work.get("id", ""),
-        }
+        # Top-level concepts and keywords, skipping entries without a name
+        concepts = [
+            name
+            for c in get("concepts") or ()
+            if c.get("level", 0) == 0 and (name := c.get("display_name"))
+        ]
+        keywords = [name for k in get("keywords") or () if (name := k.get("display_name"))]
+
+        work_id = get("id") or ""
+        return Paper(
+            id=work_id.rsplit("/", 1)[-1],
+            doi=get("doi") or "",
+            title=get("title") or "",
+            publication_date=get("publication_date") or "",
+            journal=journal,
+            authors=", ".join(authors[:5]),  # Limit to 5 authors
+            abstract=get("abstract") or self._rebuild_abstract(get("abstract_inverted_index")),
+            language=get("language") or "en",
+            concepts=concepts,
+            keywords=keywords,
+            openalex_url=work_id,
+        )
+
+    def _rebuild_abstract(self, inverted_index: Optional[Dict[str, List[int]]]) -> str:
+        """Rebuild abstract text from the REST API's inverted index"""
+        if not inverted_index:
+            return ""
+
+        positions = {pos: word for word, indices in inverted_index.items() for pos in indices}
+        return " ".join(positions[pos] for pos in sorted(positions))
+
+    def _title_key(self, paper: Paper) -> Optional[Tuple[str, Tuple[str, ...]]]:
+        """Get a normalized (title, first authors) key for duplicate detection"""
+        title = " ".join(paper.title.lower().split())
+        authors = [name for a in paper.authors.split(",")[:3] if (name := a.strip().lower())]
+
+        # Generic titles ("Editorial", "Preface") need authors to tell works apart
+        if not title or not authors:
+            return None
+
+        return title, tuple(sorted(authors))
 
     def _days_ago(self, days: int) -> str:
         """Get date string for N days ago"""
-        from datetime import datetime, timedelta
         date = datetime.now() - timedelta(days=days)
         return date.strftime("%Y-%m-%d")
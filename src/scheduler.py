@@ -3,7 +3,10 @@ Scheduler Module
 APScheduler-based scheduled task management
 """
 
-from apscheduler.schedulers.blocking import BlockingScheduler
+import asyncio
+import inspect
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.schedulers.background import BackgroundScheduler
 from typing import Callable, Optional
 
@@ -21,14 +24,17 @@ class PaperScheduler:
         Initialize scheduler
 
         Args:
-            daily_task_func: Function to run daily
+            daily_task_func: Function or coroutine function to run daily
             trigger_time: Daily trigger time (HH:MM)
             timezone: Timezone for scheduling
         """
         self.daily_task_func = daily_task_func
         self.trigger_time = trigger_time
         self.timezone = timezone
-        self.scheduler = BlockingScheduler()
+        # The scheduler owns one long-lived event loop; coroutine jobs run on
+        # it directly, plain functions on the scheduler's executor threads
+        self.loop = asyncio.new_event_loop()
+        self.scheduler = AsyncIOScheduler(event_loop=self.loop)
 
     def start(self, run_immediately: bool = False):
         """
@@ -54,17 +60,29 @@ class PaperScheduler:
         if run_immediately:
             print("[Scheduler] Running task immediately...")
             try:
-                self.daily_task_func()
+                result = self.daily_task_func()
+                if inspect.isawaitable(result):
+                    self.loop.run_until_complete(result)
             except Exception as e:
                 print(f"[Scheduler] Immediate run failed: {e}")
 
+        self.scheduler.start()
         try:
-            self.scheduler.start()
+            self.loop.run_forever()
         except (KeyboardInterrupt, SystemExit):
             print("[Scheduler] Stopped")
+        finally:
+            if self.scheduler.running:
+                # AsyncIOScheduler queues shutdown onto the loop, so run the
+                # loop once more before closing it
+                self.scheduler.shutdown(wait=False)
+                self.loop.run_until_complete(asyncio.sleep(0))
+            self.loop.close()
 
     def stop(self):
         """Stop scheduler"""
         if self.scheduler.running:
             self.scheduler.shutdown(wait=False)
             print("[Scheduler] Scheduler stopped")
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
@@ -3,9 +3,60 @@ Abstract Summarizer Module
 Generates bilingual summaries using LLM
 """
 
-from typing import Any, Dict, List
+import asyncio
+import hashlib
+import json
+import sqlite3
+from contextlib import closing, nullcontext
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
-from openai import OpenAI
+from openai import AsyncOpenAI
+
+from .llm_batch import batch_with_fallback, gather_with_progress
+from .paper import Paper
+
+try:
+    from orjson import loads as json_loads  # Optional: faster JSON parsing
+except ImportError:
+    from json import loads as json_loads
+
+# Appended to the summarize prompt for a single-paper request; the English
+# text is the original abstract, so the model only writes the Chinese summary
+_SINGLE_INSTRUCTION = """
+
+Return ONLY a JSON object: {"zh": "<Chinese summary>"}"""
+
+# Appended to the summarize prompt when several papers share one request
+_BATCH_INSTRUCTION = """
+
+You will receive a JSON array of papers, each with fields "i", "title", "authors", "journal" and "abstract".
+Summarize every paper as described above and return ONLY a JSON object:
+{"summaries": [{"i": <paper index>, "zh": "<Chinese summary>"}, ...]}"""
+
+# Abstracts are clipped to this many characters before being sent
+_MAX_ABSTRACT_CHARS = 2000
+
+# Upper bound on the combined abstract length of one batched request
+_MAX_BATCH_CHARS = 8000
+
+# Chinese text of a failed summary; failures are never cached
+_FAILED_ZH = "（摘要生成失败）"
+
+# Keys per SELECT, below SQLite's bound-parameter limit
+_CACHE_QUERY_SIZE = 500
+
+
+def _clip_abstract(abstract: str) -> str:
+    """Cut an over-long abstract at its last sentence end within _MAX_ABSTRACT_CHARS"""
+    if len(abstract) <= _MAX_ABSTRACT_CHARS:
+        return abstract
+
+    end = max(
+        abstract.rfind(". ", 0, _MAX_ABSTRACT_CHARS),
+        abstract.rfind("。", 0, _MAX_ABSTRACT_CHARS),
+    )
+    return abstract[:end + 1] if end > 0 else abstract[:_MAX_ABSTRACT_CHARS]
 
 
 class AbstractSummarizer:
@@ -18,6 +69,9 @@ class AbstractSummarizer:
         api_key: str = "",
         base_url: str = "",
         summarize_prompt: str = "",
+        max_concurrency: int = 8,
+        batch_size: int = 5,
+        cache_path: Optional[str] = None,
     ):
         """
         Initialize summarizer
@@ -28,21 +82,26 @@ class AbstractSummarizer:
             api_key: API key
             base_url: API base URL
             summarize_prompt: Prompt template
+            max_concurrency: Maximum number of LLM requests in flight
+            batch_size: Maximum number of papers summarized per LLM request
+            cache_path: SQLite file caching summaries across runs; None
+                disables caching
         """
         self.provider = provider
         self.model = model
         self.summarize_prompt = summarize_prompt
+        self.max_concurrency = max(1, max_concurrency)
+        self.batch_size = max(1, batch_size)
+        self.cache_path = cache_path
 
-        if api_key:
-            self.client = OpenAI(api_key=api_key, base_url=base_url)
-        else:
-            self.client = None
+        self._api_key = api_key
+        self._base_url = base_url
 
     def summarize_batch(
         self,
-        papers: List[Dict[str, Any]],
+        papers: List[Paper],
         show_progress: bool = False,
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Paper]:
         """
         Generate summaries for papers
 
@@ -53,78 +112,305 @@ class AbstractSummarizer:
         Returns:
             Papers with summaries added
         """
-        if not self.client:
+        return asyncio.run(self.asummarize_batch(papers, show_progress))
+
+    async def asummarize_batch(
+        self,
+        papers: List[Paper],
+        show_progress: bool = False,
+        aclient: Optional[AsyncOpenAI] = None,
+    ) -> List[Paper]:
+        """
+        Generate summaries for papers, inside a running event loop
+
+        Args:
+            papers: List of papers
+            show_progress: Show progress bar
+            aclient: Async client to share with other LLM steps; when None
+                a client scoped to this call is opened
+
+        Returns:
+            Papers with summaries added
+        """
+        if not self._api_key:
             print("[Summarizer] No API key configured, skipping summarization")
             return papers
 
-        results = []
-        iterator = papers
+        # Only papers without a cached summary go to the LLM
+        keys = [self._cache_key(paper) for paper in papers]
+        cached = self._load_cached(keys)
+        pending = [i for i, key in enumerate(keys) if key not in cached]
 
-        if show_progress:
-            from tqdm import tqdm
-            iterator = tqdm(iterator, desc="Generating Summaries")
+        if cached:
+            print(f"[Summarizer] {len(papers) - len(pending)} summaries loaded from cache")
 
-        for paper in iterator:
-            summary = self._summarize_paper(paper)
-            paper["summary_zh"] = summary.get("zh", "")
-            paper["summary_en"] = summary.get("en", paper.get("abstract", ""))
+        fresh = {}
+        if pending:
+            # A client of our own must not outlive this call's event loop
+            async with nullcontext(aclient) if aclient else self._async_client() as client:
+                generated = await self._summarize_all(client, [papers[i] for i in pending], show_progress)
+            fresh = dict(zip(pending, generated))
+            self._store_cached({
+                keys[i]: summary
+                for i, summary in fresh.items()
+                if papers[i].abstract and summary.get("zh") and summary.get("en") and summary["zh"] != _FAILED_ZH
+            })
+
+        summaries = [cached[key] if key in cached else fresh[i] for i, key in enumerate(keys)]
+
+        results = []
+        for paper, summary in zip(papers, summaries):
+            paper.summary_zh = summary.get("zh", "")
+            paper.summary_en = summary.get("en", paper.abstract)
             results.append(paper)
 
         return results
 
-    def _summarize_paper(self, paper: Dict[str, Any]) -> Dict[str, str]:
+    def _cache_key(self, paper: Paper) -> str:
+        """Hash of model, prompt, title and abstract identifying a summary"""
+        content = f"{self.model}|{self.summarize_prompt}{_SINGLE_INSTRUCTION}|{paper.title}|{paper.abstract}"
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _connect_cache(self) -> Optional[sqlite3.Connection]:
+        """Open the summary cache database, creating it if needed"""
+        if not self.cache_path:
+            return None
+
+        try:
+            Path(self.cache_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.cache_path)
+            conn.execute("CREATE TABLE IF NOT EXISTS summaries (key TEXT PRIMARY KEY, zh TEXT NOT NULL, en TEXT NOT NULL)")
+            return conn
+        except sqlite3.Error as e:
+            print(f"[Summarizer] Summary cache unavailable: {e}")
+            return None
+
+    def _load_cached(self, keys: List[str]) -> Dict[str, Dict[str, str]]:
+        """Look up cached summaries by key"""
+        conn = self._connect_cache()
+        if conn is None:
+            return {}
+
+        cached = {}
+        with closing(conn):
+            try:
+                for start in range(0, len(keys), _CACHE_QUERY_SIZE):
+                    batch = keys[start:start + _CACHE_QUERY_SIZE]
+                    rows = conn.execute(
+                        f"SELECT key, zh, en FROM summaries WHERE key IN ({','.join('?' * len(batch))})",
+                        batch,
+                    )
+                    cached.update({key: {"zh": zh, "en": en} for key, zh, en in rows})
+            except sqlite3.Error as e:
+                print(f"[Summarizer] Summary cache read failed: {e}")
+
+        return cached
+
+    def _store_cached(self, summaries: Dict[str, Dict[str, str]]):
+        """Save generated summaries by key"""
+        if not summaries:
+            return
+
+        conn = self._connect_cache()
+        if conn is None:
+            return
+
+        with closing(conn):
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO summaries (key, zh, en) VALUES (?, ?, ?)",
+                        [(key, s.get("zh", ""), s.get("en", "")) for key, s in summaries.items()],
+                    )
+            except sqlite3.Error as e:
+                print(f"[Summarizer] Summary cache write failed: {e}")
+
+    def _async_client(self) -> AsyncOpenAI:
+        """Create an async client with this summarizer's credentials"""
+        return AsyncOpenAI(api_key=self._api_key, base_url=self._base_url)
+
+    async def _summarize_all(
+        self,
+        aclient: AsyncOpenAI,
+        papers: List[Paper],
+        show_progress: bool = False,
+    ) -> List[Dict[str, str]]:
+        """
+        Summarize all papers concurrently, bounded by max_concurrency
+
+        Returns:
+            List of summaries, aligned with papers
+        """
+        sem = asyncio.Semaphore(self.max_concurrency)
+
+        # Start with the highest-scoring papers so they finish first
+        order = sorted(range(len(papers)), key=lambda i: papers[i].relevance_score, reverse=True)
+        chunks = self._chunk(papers, order)
+
+        tasks = [self._summarize_chunk(aclient, [papers[i] for i in chunk], sem) for chunk in chunks]
+        results = await gather_with_progress(tasks, "Generating Summaries", show_progress)
+
+        summaries = [{}] * len(papers)
+        for chunk, chunk_summaries in zip(chunks, results):
+            for i, summary in zip(chunk, chunk_summaries):
+                summaries[i] = summary
+
+        return summaries
+
+    def _chunk(self, papers: List[Paper], order: List[int]) -> List[List[int]]:
+        """
+        Group paper indices into batches
+
+        A batch holds at most batch_size papers and, unless it is a single
+        paper, at most _MAX_BATCH_CHARS of abstract text.
+        """
+        chunks = []
+        chunk: List[int] = []
+        chars = 0
+
+        for i in order:
+            size = min(len(papers[i].abstract), _MAX_ABSTRACT_CHARS)
+            if chunk and (len(chunk) >= self.batch_size or chars + size > _MAX_BATCH_CHARS):
+                chunks.append(chunk)
+                chunk, chars = [], 0
+            chunk.append(i)
+            chars += size
+
+        if chunk:
+            chunks.append(chunk)
+
+        return chunks
+
+    async def _summarize_chunk(
+        self,
+        aclient: AsyncOpenAI,
+        papers: List[Paper],
+        sem: asyncio.Semaphore,
+    ) -> List[Dict[str, str]]:
+        """
+        Summarize a batch of papers in one LLM request, retrying skipped papers one by one
+
+        Returns:
+            List of summaries, aligned with papers
+        """
+        async def summarize_batch(batch: List[Paper]) -> Dict[int, Dict[str, str]]:
+            # Papers without an abstract need no LLM call
+            pending = [i for i, paper in enumerate(batch) if paper.abstract]
+            if len(pending) < 2:
+                return {}
+
+            async with sem:
+                response = await aclient.chat.completions.create(
+                    **self._batch_request([batch[i] for i in pending])
+                )
+            parsed = self._parse_many(response.choices[0].message.content or "", len(pending))
+            return {pending[j]: {"zh": zh, "en": batch[pending[j]].abstract} for j, zh in parsed.items()}
+
+        async def summarize_single(paper: Paper) -> Dict[str, str]:
+            return await self._summarize_paper(aclient, paper, sem)
+
+        return await batch_with_fallback(papers, summarize_batch, summarize_single, "Summarizer")
+
+    async def _summarize_paper(
+        self,
+        aclient: AsyncOpenAI,
+        paper: Paper,
+        sem: asyncio.Semaphore,
+    ) -> Dict[str, str]:
         """
         Summarize a single paper
 
         Args:
-            paper: Paper dictionary
+            aclient: Async OpenAI client
+            paper: Paper to summarize
+            sem: Semaphore bounding concurrent requests
 
         Returns:
             Dict with 'zh' and 'en' summaries
         """
-        title = paper.get("title", "")
-        authors = paper.get("authors", "")
-        journal = paper.get("journal", "")
-        abstract = paper.get("abstract", "")
+        title = paper.title
+        authors = paper.authors
+        journal = paper.journal
+        abstract = _clip_abstract(paper.abstract)
 
         if not abstract:
             return {
                 "zh": "（原文摘要不可用）",
- "(Abstract                "en": not available)",
+                "en": "(Abstract not available)",
             }
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.summarize_prompt},
-                    {"role": "user", "content": f"标题：{title}\n作者：{authors}\n期刊：{journal}\n原文摘要：{abstract}"},
-                ],
-                temperature=0.5,
-                max_tokens=500,
-            )
-
-            content = response.choices[0].message.content or ""
-
-            # Parse bilingual summary
-            zh_match = content.find("【中文摘要】")
-            en_match = content.find("English Abstract:")
-
-            zh = ""
-            if zh_match != -1 and en_match != -1:
-                zh = content[zh_match + 6:en_match].strip()
-            elif zh_match != -1:
-                zh = content[zh_match + 6:].strip()
-
-            en = ""
-            if en_match != -1:
-                en = content[en_match + 17:].strip()
-
-            return {"zh": zh, "en": en}
+            async with sem:
+                response = await aclient.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": self.summarize_prompt + _SINGLE_INSTRUCTION},
+                        {"role": "user", "content": f"标题：{title}\n作者：{authors}\n期刊：{journal}\n原文摘要：{abstract}"},
+                    ],
+                    temperature=0.5,
+                    max_tokens=500,
+                    response_format={"type": "json_object"},
+                )
+
+            return {"zh": self._parse_summary(response.choices[0].message.content or ""), "en": paper.abstract}
 
         except Exception as e:
             print(f"[Summarizer] Error: {e}")
             return {
-                "zh": f"（摘要生成失败）",
+                "zh": _FAILED_ZH,
                 "en": f"(Summary generation failed: {e})",
             }
+
+    def _batch_request(self, papers: List[Paper]) -> Dict[str, Any]:
+        """Build chat completion arguments for summarizing several papers at once"""
+        items = [
+            {
+                "i": i,
+                "title": paper.title,
+                "authors": paper.authors,
+                "journal": paper.journal,
+                "abstract": _clip_abstract(paper.abstract),
+            }
+            for i, paper in enumerate(papers)
+        ]
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.summarize_prompt + _BATCH_INSTRUCTION},
+                {"role": "user", "content": json.dumps(items, ensure_ascii=False)},
+            ],
+            "temperature": 0.5,
+            "max_tokens": 500 * len(papers),
+            "response_format": {"type": "json_object"},
+        }
+
+    def _parse_many(self, content: str, count: int) -> Dict[int, str]:
+        """
+        Parse a batched summary response
+
+        Args:
+            content: Model response containing a JSON object
+            count: Number of papers in the request
+
+        Returns:
+            Dict mapping paper index to its Chinese summary; papers with an
+            empty summary are left out so they are retried individually
+        """
+        data = json_loads(content)
+        entries = data["summaries"] if isinstance(data, dict) else data
+
+        summaries = {}
+        for entry in entries:
+            i = int(entry["i"])
+            zh = str(entry.get("zh") or "").strip()
+            if 0 <= i < count and zh:
+                summaries[i] = zh
+
+        return summaries
+
+    def _parse_summary(self, content: str) -> str:
+        """Parse a single-paper JSON summary response into its Chinese summary"""
+        zh = str(json_loads(content).get("zh") or "").strip()
+        if not zh:
+            raise ValueError("empty summary")
+        return zh
@@ -1,17 +1,28 @@
 """
 PaperSeeker Test Suite
-Tests complete paper search -> filter -> summarize"""
+Tests complete paper search -> filter -> summarize -> email flow"""
 
+import asyncio
+import gzip
+import json
+import os
 import sys
- -> email flow
+import tempfile
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
+from types import SimpleNamespace
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.config import get_config
+from src.config import Config, get_config
+from src.paper import Paper
 from src.paper_searcher import OpenAlexSearcher
-from src.paper_filter import KeywordFilter
+from src import paper_filter
+from src.paper_filter import KeywordFilter, PaperFilter
+from src.summarizer import AbstractSummarizer, _clip_abstract
 from src.email_sender import EmailSender
 
 
@@ -30,6 +41,33 @@ def test_config_loading():
         return False
 
 
+def test_config_env_reload():
+    """Test that reloading picks up changed ${VAR} environment values"""
+    print("\n=== Test 1b: Configuration Environment Reload ===")
+    with tempfile.TemporaryDirectory() as config_dir:
+        config_path = Path(config_dir) / "config.yaml"
+        config_path.write_text('email:\n  smtp_server: "${PAPERSEEKER_TEST_SMTP}"\n', encoding="utf-8")
+        prompts_path = str(Path(config_dir) / "prompts.yaml")
+
+        os.environ["PAPERSEEKER_TEST_SMTP"] = "smtp.one.example"
+        try:
+            config = Config(str(config_path), prompts_path)
+            assert config.email["smtp_server"] == "smtp.one.example"
+
+            os.environ["PAPERSEEKER_TEST_SMTP"] = "smtp.two.example"
+            config.reload()
+            assert config.email["smtp_server"] == "smtp.two.example"
+
+            # Each Config gets its own copy of the parsed file
+            config.email["smtp_server"] = "changed"
+            assert Config(str(config_path), prompts_path).email["smtp_server"] == "smtp.two.example"
+        finally:
+            del os.environ["PAPERSEEKER_TEST_SMTP"]
+
+    print("[OK] Environment changes picked up on reload")
+    return True
+
+
 def test_paper_search():
     """Test paper search"""
     print("\n=== Test 2: OpenAlex Paper Search ===")
@@ -44,8 +82,8 @@ def test_paper_search():
         print(f"[OK] Found {len(papers)} papers")
         if papers:
             paper = papers[0]
-            print(f"  Example: {paper['title'][:50]}...")
-            print(f"  Journal: {paper['journal']}")
+            print(f"  Example: {paper.title[:50]}...")
+            print(f"  Journal: {paper.journal}")
         return len(papers) >= 0
     except Exception as e:
         print(f"[FAIL] Paper search failed: {e}")
@@ -87,6 +125,265 @@ def test_keyword_filter():
         return False
 
 
+def test_keyword_scoring():
+    """Test keyword scoring on whole words, counting each keyword once"""
+    print("\n=== Test 3b: Keyword Scoring ===")
+    # Score with the Aho-Corasick backend (if installed) and the regex fallback
+    automaton = paper_filter.ahocorasick
+    try:
+        for backend in (automaton, None):
+            paper_filter.ahocorasick = backend
+            keyword_filter = KeywordFilter(
+                keywords=["Electric Truck", "battery swapping", "hydrogen"],
+                exclude_keywords=["passenger car"],
+            )
+
+            paper = Paper(
+                title="Battery Swapping for electric trucks",
+                abstract="An electric truck fleet with battery swapping stations.",
+            )
+            assert keyword_filter._score_paper(paper) == 2
+
+            excluded = Paper(
+                title=paper.title,
+                abstract="Compared with passenger car charging.",
+            )
+            assert keyword_filter._score_paper(excluded) == 0
+
+            # Keywords sharing a start position are all counted
+            nested_filter = KeywordFilter(keywords=["electric", "electric truck", "truck"])
+            assert nested_filter._score_paper(Paper(title="An electric truck study")) == 3
+    finally:
+        paper_filter.ahocorasick = automaton
+
+    print("[OK] Keyword scoring matches expected counts")
+    return True
+
+
+def test_search_date_range():
+    """Test search date range defaults"""
+    print("\n=== Test 3c: Search Date Range ===")
+    searcher = OpenAlexSearcher()
+    today = datetime.now().strftime("%Y-%m-%d")
+
+    assert searcher._date_range(7, None, None) == (searcher._days_ago(7), today)
+    assert searcher._date_range(7, "2025-01-01", None) == ("2025-01-01", today)
+    assert searcher._date_range(7, None, "2025-01-14") == (searcher._days_ago(7), "2025-01-14")
+
+    print("[OK] Date range resolved correctly")
+    return True
+
+
+def test_filter_single_parsing():
+    """Test single-paper LLM score parsing, including cut-off JSON"""
+    print("\n=== Test 3e: AI Score Parsing ===")
+    ai_filter = PaperFilter(filter_prompt="")
+
+    assert ai_filter._parse_single('{"score": 4, "reason": "Relevant"}') == {"score": 4, "reason": "Relevant"}
+    assert ai_filter._parse_single('{"score": 1, "reason": "该论文研究乘用')["score"] == 1
+    assert ai_filter._parse_single('{"score": 1, "reason": "该论文研究乘用')["reason"] == "该论文研究乘用"
+    assert ai_filter._parse_single("评分：5\n理由：高度相关")["score"] == 5
+
+    print("[OK] Scores parsed from JSON and truncated replies")
+    return True
+
+
+def _serve_json(payload, compress=False, truncate=False):
+    """Start a local HTTP server answering every GET with payload (or its first half)"""
+    body = json.dumps(payload).encode("utf-8")
+    if compress:
+        body = gzip.compress(body)
+    sent = body[:len(body) // 2] if truncate else body
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            if compress:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(sent)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_rest_search_cached():
+    """Test repeated REST searches against a (cached) session"""
+    print("\n=== Test 3d: Cached REST Search ===")
+    work = {
+        "id": "https://openalex.org/W1",
+        "title": "Electric truck battery swapping",
+        "publication_date": "2025-01-02",
+        "authorships": [{"author": {"display_name": "Ann Lee"}}],
+        "abstract_inverted_index": {"Battery": [0], "swapping": [1]},
+    }
+
+    for compress in (False, True):
+        server = _serve_json({"meta": {}, "results": [work]}, compress=compress)
+        try:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                searcher = OpenAlexSearcher(
+                    api_url=f"http://127.0.0.1:{server.server_port}",
+                    cache_path=str(Path(cache_dir) / "openalex"),
+                )
+                for _ in range(2):
+                    papers = searcher._search_rest_api("electric truck", "2025-01-01", "2025-01-03")
+                    assert [p.id for p in papers] == ["W1"]
+                    assert papers[0].abstract == "Battery swapping"
+                searcher.session.close()
+        finally:
+            server.shutdown()
+
+    # A connection dropped mid-stream is reported, not raised
+    server = _serve_json({"meta": {}, "results": [work] * 50}, truncate=True)
+    try:
+        searcher = OpenAlexSearcher(api_url=f"http://127.0.0.1:{server.server_port}")
+        assert searcher._search_rest_api("electric truck", "2025-01-01", "2025-01-03") == []
+        searcher.session.close()
+    finally:
+        server.shutdown()
+
+    print("[OK] Repeated REST searches return the same papers")
+    return True
+
+
+def _fake_llm(reply):
+    """Async OpenAI stand-in whose chat completions return reply(request)"""
+    requests = []
+
+    async def create(**request):
+        requests.append(request)
+        message = SimpleNamespace(content=reply(request))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return client, requests
+
+
+def test_filter_batch_scoring():
+    """Test batched LLM scoring, re-scoring papers the model skipped"""
+    print("\n=== Test 3f: AI Batch Scoring ===")
+    ai_filter = PaperFilter(filter_prompt="")
+
+    content = '```json\n[{"i": 0, "score": 5, "reason": "Core"}, {"i": 7, "score": 1}]\n```'
+    assert ai_filter._parse_many(content, 2) == {0: {"score": 5, "reason": "Core"}}
+
+    def reply(request):
+        if request["messages"][-1]["content"].startswith("["):
+            return '[{"i": 0, "score": 5, "reason": "Core"}]'
+        return '{"score": 2, "reason": "Side topic"}'
+
+    client, requests = _fake_llm(reply)
+    papers = [Paper(title="Electric trucks"), Paper(title="Passenger cars")]
+    scored = asyncio.run(ai_filter._ascore_chunk(client, papers, asyncio.Semaphore(2)))
+
+    assert scored == [{"score": 5, "reason": "Core"}, {"score": 2, "reason": "Side topic"}]
+    assert len(requests) == 2
+
+    print("[OK] Skipped papers scored individually")
+    return True
+
+
+def test_summarizer_batching():
+    """Test summary batching and batched response parsing"""
+    print("\n=== Test 3g: Summary Batching ===")
+    summarizer = AbstractSummarizer(batch_size=2)
+
+    papers = [Paper(abstract="a" * 3000), Paper(abstract="b" * 10), Paper(abstract="c" * 10), Paper()]
+    assert summarizer._chunk(papers, [0, 1, 2, 3]) == [[0, 1], [2, 3]]
+
+    content = '{"summaries": [{"i": 1, "zh": "摘要"}, {"i": 0, "zh": ""}, {"i": 5, "zh": "越界"}]}'
+    assert summarizer._parse_many(content, 2) == {1: "摘要"}
+    assert summarizer._parse_summary('{"zh": " 中文摘要 "}') == "中文摘要"
+
+    print("[OK] Summaries batched and parsed")
+    return True
+
+
+def test_clip_abstract():
+    """Test sentence-boundary clipping of long abstracts"""
+    print("\n=== Test 3h: Abstract Clipping ===")
+    clipped = _clip_abstract("First sentence. " * 200)
+    assert len(clipped) <= 2000 and clipped.endswith("sentence.")
+    assert _clip_abstract("x" * 2500) == "x" * 2000
+    assert _clip_abstract("Short.") == "Short."
+
+    print("[OK] Abstracts clipped at sentence ends")
+    return True
+
+
+def test_summary_cache():
+    """Test the on-disk summary cache round trip"""
+    print("\n=== Test 3i: Summary Cache ===")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache_path = str(Path(cache_dir) / "summaries.db")
+        summarizer = AbstractSummarizer(model="m", summarize_prompt="v1", cache_path=cache_path)
+        paper = Paper(title="Electric trucks", abstract="Battery swapping.")
+        key = summarizer._cache_key(paper)
+
+        assert summarizer._load_cached([key]) == {}
+        summarizer._store_cached({key: {"zh": "中文", "en": "English"}})
+        assert summarizer._load_cached([key, "missing"]) == {key: {"zh": "中文", "en": "English"}}
+
+        # Editing the prompt invalidates cached summaries
+        edited = AbstractSummarizer(model="m", summarize_prompt="v2", cache_path=cache_path)
+        assert edited._cache_key(paper) != key
+
+    print("[OK] Summaries stored and loaded by key")
+    return True
+
+
+def test_search_dedupe():
+    """Test duplicate detection by id and by title plus authors"""
+    print("\n=== Test 3j: Search Dedupe ===")
+    is_new = OpenAlexSearcher()._duplicate_checker()
+
+    assert is_new(Paper(id="W1", title="Electric Trucks", authors="Ann Lee, Bo Li"))
+    assert not is_new(Paper(id="W1", title="Other title"))
+    # Same work indexed under another ID
+    assert not is_new(Paper(id="W2", title="electric  trucks", authors="Bo Li, Ann Lee"))
+    # Author-less works with a generic title are kept apart
+    assert is_new(Paper(id="W3", title="Editorial"))
+    assert is_new(Paper(id="W4", title="Editorial"))
+
+    print("[OK] Duplicates removed, distinct works kept")
+    return True
+
+
+def test_search_merge_dedupe():
+    """Test merging per-keyword results newest first without duplicates"""
+    print("\n=== Test 3k: Search Merge ===")
+    results = {
+        "truck": [
+            Paper(id="W1", title="Electric Trucks", authors="Ann Lee, Bo Li", publication_date="2025-01-05"),
+            Paper(id="W2", title="Battery swapping", authors="Cy Wu", publication_date="2025-01-01"),
+        ],
+        "battery": [
+            Paper(id="W3", title="Fleet charging", authors="Di Xu", publication_date="2025-01-03"),
+            Paper(id="W1", title="Electric Trucks", authors="Ann Lee, Bo Li", publication_date="2025-01-05"),
+            # Same work indexed under another ID
+            Paper(id="W9", title="electric  trucks", authors="Bo Li, Ann Lee", publication_date="2025-01-02"),
+        ],
+    }
+    searcher = OpenAlexSearcher()
+    searcher._search_single_keyword = lambda keyword, **kwargs: list(results[keyword])
+
+    papers = searcher.search(["truck", "battery"], from_date="2025-01-01", to_date="2025-01-05")
+    assert [p.id for p in papers] == ["W1", "W3", "W2"]
+
+    streamed = searcher.iter_search(["truck", "battery"], from_date="2025-01-01", to_date="2025-01-05")
+    assert sorted(p.id for p in streamed) == ["W1", "W2", "W3"]
+
+    print("[OK] Results merged newest first, duplicates removed")
+    return True
+
+
 def test_email_sender():
     """Test email sender initialization"""
     print("\n=== Test 4: Email Sender Initialization ===")
@@ -153,8 +450,8 @@ def test_full_flow():
         # 3. Prepare summaries
         print("[3/4] Preparing summaries...")
         for paper in filtered:
-            paper["summary_zh"] = paper.get("abstract", "")[:300] + "..."
-            paper["summary_en"] = "（Auto summary placeholder）"
+            paper.summary_zh = paper.abstract[:300] + "..."
+            paper.summary_en = "（Auto summary placeholder）"
 
         # 4. Build email
         print("[4/4] Building email content...")
@@ -180,8 +477,19 @@ def main():
 
     tests = [
         test_config_loading,
+        test_config_env_reload,
         test_paper_search,
         test_keyword_filter,
+        test_keyword_scoring,
+        test_search_date_range,
+        test_rest_search_cached,
+        test_filter_single_parsing,
+        test_filter_batch_scoring,
+        test_summarizer_batching,
+        test_clip_abstract,
+        test_summary_cache,
+        test_search_dedupe,
+        test_search_merge_dedupe,
         test_email_sender,
         test_full_flow,
     ]